@@ -8,14 +8,13 @@ all the scheduling constraints.
 """
 
 import csv
-import pandas as pd
-from typing import List, Dict, Set, Tuple, Optional, Any
+import numpy as np
+from typing import List, Dict, Set, FrozenSet, Tuple, Optional, Any, Callable
 from dataclasses import dataclass
 from datetime import datetime, time
 import random
 import copy
-from collections import defaultdict
-import json
+from collections import Counter, defaultdict
 
 
 @dataclass
@@ -47,9 +46,14 @@ class Instructor:
     """Represents an instructor with their qualifications and preferences"""
     instructor_id: str
     name: str
-    qualified_courses: List[str]
+    qualified_courses: FrozenSet[str]
     preference: str  # Morning, Afternoon, No_Thursday, Any
     
+    def __post_init__(self):
+        # Stored as a frozenset so "course in qualified_courses" is a hash lookup
+        if not isinstance(self.qualified_courses, frozenset):
+            self.qualified_courses = frozenset(self.qualified_courses)
+    
     def __str__(self):
         return f"{self.name} (ID: {self.instructor_id})"
 
@@ -125,14 +129,40 @@ class TimetableCSP:
         self.domains: Dict[str, List[Tuple[TimeSlot, Room, Instructor]]] = {}
         self.assignments: Dict[str, Tuple[TimeSlot, Room, Instructor]] = {}
         
+        # Room / instructor pools each domain was built from, keyed by session type
+        # and course, and the (session type, course) pair used by each session
+        self._rooms_by_type: Dict[str, List[Room]] = {}
+        self._instructors_by_course: Dict[str, List[Instructor]] = {}
+        self._domain_pools: Dict[str, Tuple[str, str]] = {}
+        self._degree: Dict[str, int] = {}
+        self._consistency = "none"
+        self._progress_callback: Optional[Callable[[float], None]] = None
+        
         # Constraint tracking
         self.constraint_violations: List[str] = []
         self.soft_constraint_violations: List[str] = []
         
+        # Fraction of sessions assigned so far, and a flag another thread can set
+        # to stop a running solve
+        self.progress: float = 0.0
+        self.stop_requested: bool = False
+        
+        # Fingerprint of the data the current model was built from, kept by the
+        # caller so an unchanged model is not rebuilt
+        self.built_signature: Optional[Tuple] = None
+        
     def load_data_from_csv(self, data_dir: str = "data"):
         """Load all data from CSV files"""
         print("Loading data from CSV files...")
         
+        # Start from fresh lists so loading again replaces the data instead of adding to it
+        self.time_slots = []
+        self.rooms = []
+        self.instructors = []
+        self.courses = []
+        self.sections = []
+        self.sessions = []
+        
         try:
             # Load time slots
             self._load_time_slots(f"{data_dir}/Timeslots.csv")
@@ -194,7 +224,7 @@ class TimetableCSP:
             for row in reader:
                 if row['InstructorID']:  # Skip empty rows
                     # Parse qualified courses (comma-separated)
-                    qualified_courses = [course.strip() for course in row['QualifiedCourses'].split(',')]
+                    qualified_courses = frozenset(course.strip() for course in row['QualifiedCourses'].split(','))
                     
                     instructor = Instructor(
                         instructor_id=row['InstructorID'],
@@ -250,6 +280,16 @@ class TimetableCSP:
                     )
                     self.sessions.append(session)
     
+    def copy_for_solve(self) -> "TimetableCSP":
+        """Copy that can build and solve on another thread without changing this solver"""
+        # Loading, building and solving all replace the containers they fill, so a
+        # shallow copy is enough; only courses is appended to in place by the build
+        clone = copy.copy(self)
+        clone.courses = list(self.courses)
+        clone.progress = 0.0
+        clone.stop_requested = False
+        return clone
+    
     def build_csp_model(self):
         """Build the CSP model with variables, domains, and constraints"""
         print("Building CSP model...")
@@ -257,15 +297,41 @@ class TimetableCSP:
         # Set variables (all sessions that need to be scheduled)
         self.variables = self.sessions.copy()
         
+        # Integer-coded copies of the data used by the hot checks
+        self._build_index_arrays()
+        
         # Build domains for each variable
         self._build_domains()
         
+        # Degree of a session: how many other sessions could be given one of its instructors
+        course_ids = list(self._instructors_by_course)
+        course_counts = Counter(course_id for _, course_id in self._domain_pools.values())
+        # Instructors are matched by position, since instructor IDs are not unique
+        position = {id(inst): k for k, inst in enumerate(self.instructors)}
+        qualified = np.zeros((len(course_ids), len(self.instructors)), dtype=np.int32)
+        for i, course_id in enumerate(course_ids):
+            qualified[i, [position[id(inst)] for inst in self._instructors_by_course[course_id]]] = 1
+        shares = (qualified @ qualified.T) > 0
+        sharing_sessions = shares @ np.array([course_counts[course_id] for course_id in course_ids])
+        # A course shares with itself, so its own session is taken back out
+        course_degree = dict(zip(course_ids, (sharing_sessions - shares.diagonal()).tolist()))
+        self._degree = {session_id: course_degree[course_id]
+                        for session_id, (_, course_id) in self._domain_pools.items()}
+        
         print(f"Built CSP model with {len(self.variables)} variables")
         print(f"Average domain size: {sum(len(domain) for domain in self.domains.values()) / len(self.domains) if self.domains else 0:.1f}")
     
     def _build_domains(self):
         """Build domains for each variable (session)"""
-        for session in self.variables:
+        # Rooms, instructors and time slots don't change between sessions, so the
+        # room and instructor pools are worked out once per session type / course
+        # and shared by every session that needs them
+        self.domains = {}
+        self._rooms_by_type = {}
+        self._instructors_by_course = {}
+        self._domain_pools = {}
+        
+        for session_idx, session in enumerate(self.variables):
             domain = []
             
             # Find the course for this session - try exact match first, then partial match
@@ -289,23 +355,27 @@ class TimetableCSP:
                 self.courses.append(course)
             
             # Find qualified instructors for this course
-            qualified_instructors = []
-            for instructor in self.instructors:
-                # Check if instructor is qualified for this course
-                if (course.course_id in instructor.qualified_courses or 
-                    any(course.course_id in course_code for course_code in instructor.qualified_courses)):
-                    qualified_instructors.append(instructor)
-            
-            # If no qualified instructors found, use all instructors as fallback
-            if not qualified_instructors:
-                print(f"Warning: No qualified instructors found for course {course.course_id}, using all instructors")
-                qualified_instructors = self.instructors
+            qualified_instructors = self._instructors_by_course.get(course.course_id)
+            if qualified_instructors is None:
+                qualified_instructors = []
+                for instructor in self.instructors:
+                    # Check if instructor is qualified for this course
+                    if (course.course_id in instructor.qualified_courses or 
+                        any(course.course_id in course_code for course_code in instructor.qualified_courses)):
+                        qualified_instructors.append(instructor)
+                
+                # If no qualified instructors found, use all instructors as fallback
+                if not qualified_instructors:
+                    print(f"Warning: No qualified instructors found for course {course.course_id}, using all instructors")
+                    qualified_instructors = self.instructors
+                
+                self._instructors_by_course[course.course_id] = qualified_instructors
             
             # Find suitable rooms based on session type
-            suitable_rooms = []
-            for room in self.rooms:
-                if self._is_room_suitable(session, room):
-                    suitable_rooms.append(room)
+            suitable_rooms = self._rooms_by_type.get(session.session_type)
+            if suitable_rooms is None:
+                suitable_rooms = [self.rooms[j] for j in np.flatnonzero(self._suitable_mask[session_idx])]
+                self._rooms_by_type[session.session_type] = suitable_rooms
             
             if not suitable_rooms:
                 print(f"Warning: No suitable rooms found for session {session.session_id}")
@@ -318,33 +388,84 @@ class TimetableCSP:
                         domain.append((time_slot, room, instructor))
             
             self.domains[session.session_id] = domain
+            self._domain_pools[session.session_id] = (session.session_type, course.course_id)
+    
+    def _build_index_arrays(self):
+        """
+        Encode sessions, rooms, time slots and instructors as parallel NumPy arrays
+        
+        Entities are referred to by their position in self.variables and self.rooms
+        and by slot_id for time slots.
+        """
+        self._session_index = {s.session_id: i for i, s in enumerate(self.variables)}
+        self._room_index = {r.room_id: j for j, r in enumerate(self.rooms)}
+        
+        # Session types: LAB=0, TUT=1, LEC=2, anything else=-1
+        session_types = {"LAB": 0, "TUT": 1, "LEC": 2}
+        self._session_type_id = np.array([session_types.get(s.session_type, -1) for s in self.variables],
+                                         dtype=np.int8)
+        
+        # Room types: Lab=0, Lecture=1, anything else=-1
+        room_types = {"Lab": 0, "Lecture": 1}
+        self._room_type_id = np.array([room_types.get(r.room_type, -1) for r in self.rooms], dtype=np.int8)
+        
+        # Lab sessions need Lab rooms, Lecture/TUT sessions need Lecture rooms
+        needs_lab = (self._session_type_id == 0)[:, None]
+        needs_lecture = np.isin(self._session_type_id, (1, 2))[:, None]
+        self._suitable_mask = ((~needs_lab | (self._room_type_id == 0)[None, :]) &
+                               (~needs_lecture | (self._room_type_id == 1)[None, :]))
+        
+        # Time slot periods used by the soft constraints, indexed by slot_id
+        n_slots = max((ts.slot_id for ts in self.time_slots), default=-1) + 1
+        self._slot_is_early = np.zeros(n_slots, dtype=bool)
+        self._slot_is_late = np.zeros(n_slots, dtype=bool)
+        self._slot_is_thursday = np.zeros(n_slots, dtype=bool)
+        for ts in self.time_slots:
+            self._slot_is_early[ts.slot_id] = ts.start_time in ("09:00 AM", "09:45 AM")
+            self._slot_is_late[ts.slot_id] = ts.start_time in ("02:15 PM", "03:00 PM")
+            self._slot_is_thursday[ts.slot_id] = ts.day == "Thursday"
+        
+        # Instructor preferences: Morning=0, Afternoon=1, No_Thursday=2, anything else=-1.
+        # Instructor IDs are not unique, so preferences are read off each assigned instructor
+        self._preference_ids = {"Morning": 0, "Afternoon": 1, "No_Thursday": 2}
     
     def _is_room_suitable(self, session: Session, room: Room) -> bool:
         """Check if a room is suitable for a session"""
-        # Lab sessions need Lab rooms
-        if session.session_type == "LAB" and room.room_type != "Lab":
-            return False
-        
-        # Lecture/TUT sessions can use Lecture rooms
-        if session.session_type in ["TUT", "LEC"] and room.room_type != "Lecture":
-            return False
-        
-        return True
+        return bool(self._suitable_mask[self._session_index[session.session_id],
+                                        self._room_index[room.room_id]])
     
-    def solve(self, max_iterations: int = 1000) -> bool:
+    def solve(self, max_iterations: int = 1000, consistency: str = "none",
+              progress_callback: Optional[Callable[[float], None]] = None) -> bool:
         """
         Solve the CSP using backtracking algorithm
+        
+        consistency controls the propagation done after each assignment:
+        - "none": plain backtracking, each value is checked against earlier assignments
+        - "fc": forward checking, backtrack as soon as an unassigned session has
+          no consistent value left
+        - "mac": forward checking plus propagation of sessions left with a single
+          consistent value (arc consistency against singleton domains)
+        
+        progress_callback, if given, is called with the fraction of sessions
+        assigned (0.0 to 1.0) every time the search moves to a new node
         """
-        print("Starting CSP solving...")
+        if consistency not in ("none", "fc", "mac"):
+            raise ValueError(f"Unknown consistency mode: {consistency}")
+        
+        print(f"Starting CSP solving (consistency: {consistency})...")
         start_time = datetime.now()
         
         # Initialize assignments
         self.assignments = {}
         self.constraint_violations = []
         self.soft_constraint_violations = []
-    
+        self._consistency = consistency
+        self._progress_callback = progress_callback
+        self.progress = 0.0
+        
         # Use backtracking to find a solution
-        success = self._backtrack(0, max_iterations)
+        self._init_propagation()
+        success = self._propagate() is not None and self._backtrack(max_iterations)
         
         end_time = datetime.now()
         solving_time = (end_time - start_time).total_seconds()
@@ -358,62 +479,241 @@ class TimetableCSP:
         
         return success
     
-    def _backtrack(self, variable_index: int, max_iterations: int) -> bool:
+    def _backtrack(self, max_iterations: int) -> bool:
         """Recursive backtracking algorithm"""
-        if variable_index >= len(self.variables):
+        if self.stop_requested:
+            return False  # Stopped from another thread
+        
+        self.progress = len(self.assignments) / len(self.variables) if self.variables else 1.0
+        if self._progress_callback is not None:
+            self._progress_callback(self.progress)
+        
+        session = self._select_unassigned_variable()
+        if session is None:
             return True  # All variables assigned
         
         if max_iterations <= 0:
             return False  # Max iterations reached
         
-        session = self.variables[variable_index]
-        
-        # Try each value in the domain
+        # Try each value in the domain, in random order for better exploration.
+        # The permutation is drawn by NumPy (seeded from the random module, so
+        # random.seed still makes runs repeatable) rather than shuffling the whole
+        # domain list in Python at every step.
         domain = self.domains.get(session.session_id, [])
-        random.shuffle(domain)  # Randomize for better exploration
+        rng = np.random.default_rng(random.getrandbits(64))
         
-        for time_slot, room, instructor in domain:
+        for value_index in rng.permutation(len(domain)):
+            if self.stop_requested:
+                return False
+            
+            time_slot, room, instructor = domain[value_index]
+            
             # Check if this assignment violates hard constraints
-            if self._check_hard_constraints(session, time_slot, room, instructor):
-                # Make assignment
-                self.assignments[session.session_id] = (time_slot, room, instructor)
-                
+            if self._consistency == "none":
+                if not self._check_hard_constraints(session, time_slot, room, instructor):
+                    continue
+            elif not self._is_consistent(session, time_slot, room, instructor):
+                continue
+            
+            # Make assignment
+            self._assign(session, (time_slot, room, instructor))
+            
+            # Prune the other sessions' domains before going deeper
+            forced = self._propagate()
+            if forced is not None:
                 # Recursively solve remaining variables
-                if self._backtrack(variable_index + 1, max_iterations - 1):
+                if self._backtrack(max_iterations - 1):
                     return True
                 
-                # Backtrack
-                del self.assignments[session.session_id]
+                # Restore the values pruned by propagation
+                for forced_id in reversed(forced):
+                    self._unassign(forced_id)
+            
+            # Backtrack
+            self._unassign(session.session_id)
         
         return False
     
+    def _select_unassigned_variable(self) -> Optional[Session]:
+        """
+        Pick the next session to assign using the minimum remaining values heuristic,
+        breaking ties in favour of sessions that could be given an instructor of the most
+        other sessions (degree heuristic)
+        """
+        unassigned = [s for s in self.variables if s.session_id not in self.assignments]
+        if not unassigned:
+            return None
+        
+        if self._consistency == "none":
+            # Without forward checking the domains never shrink, so use their full size
+            def remaining_values(session: Session) -> int:
+                return len(self.domains.get(session.session_id, []))
+        else:
+            pool_sizes = {pool: self._live_domain_size(pool)
+                          for pool, session_ids in self._unassigned_by_pool.items() if session_ids}
+            
+            def remaining_values(session: Session) -> int:
+                return pool_sizes.get(self._pool_of.get(session.session_id), 0)
+        
+        return min(unassigned, key=lambda s: (remaining_values(s), -self._degree.get(s.session_id, 0)))
+    
+    def _init_propagation(self):
+        """Set up the bookkeeping used by the constraint checks and forward checking
+        
+        Every domain is the product time_slots x rooms x instructors, so instead of
+        copying and filtering domains the solver counts, for each room / instructor
+        pool, how many of its members are still free in each time slot. The number of
+        consistent values a session has left is then sum(free_rooms * free_instructors)
+        over the time slots.
+        """
+        n_slots = max((ts.slot_id for ts in self.time_slots), default=-1) + 1
+        
+        section_sizes: Dict[str, int] = {}
+        for section in self.sections:
+            section_sizes.setdefault(section.section_id, section.student_count)
+        
+        self._sessions_by_id: Dict[str, Session] = {}
+        self._min_capacity: Dict[str, int] = {}
+        self._pool_of: Dict[str, Tuple[Tuple[str, int], str]] = {}
+        self._unassigned_by_pool: Dict[Tuple[Tuple[str, int], str], Set[str]] = defaultdict(set)
+        self._free_rooms: Dict[Tuple[str, int], List[int]] = {}
+        self._free_instructors: Dict[str, List[int]] = {}
+        self._room_pool_keys: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        self._instructor_pool_keys: Dict[str, List[str]] = defaultdict(list)
+        self._busy_rooms: Set[Tuple[int, str]] = set()
+        self._busy_instructors: Set[Tuple[int, str]] = set()
+        
+        for session in self.variables:
+            if session.session_id not in self._domain_pools:
+                continue  # No domain, the search fails on this session anyway
+            
+            session_type, course_id = self._domain_pools[session.session_id]
+            min_capacity = section_sizes.get(session.section_id, 0)
+            
+            # Room pools also account for capacity, so only usable rooms are counted
+            room_key = (session_type, min_capacity)
+            if room_key not in self._free_rooms:
+                rooms = [r for r in self._rooms_by_type[session_type] if r.capacity >= min_capacity]
+                self._free_rooms[room_key] = [len(rooms)] * n_slots
+                for room in rooms:
+                    self._room_pool_keys[room.room_id].append(room_key)
+            
+            if course_id not in self._free_instructors:
+                instructors = self._instructors_by_course[course_id]
+                self._free_instructors[course_id] = [len(instructors)] * n_slots
+                for instructor in instructors:
+                    self._instructor_pool_keys[instructor.instructor_id].append(course_id)
+            
+            self._sessions_by_id[session.session_id] = session
+            self._min_capacity[session.session_id] = min_capacity
+            self._pool_of[session.session_id] = (room_key, course_id)
+            self._unassigned_by_pool[(room_key, course_id)].add(session.session_id)
+    
+    def _is_consistent(self, session: Session, time_slot: TimeSlot,
+                       room: Room, instructor: Instructor) -> bool:
+        """Check a domain value against the current assignments (forward checking modes)"""
+        return ((time_slot.slot_id, room.room_id) not in self._busy_rooms and
+                (time_slot.slot_id, instructor.instructor_id) not in self._busy_instructors and
+                room.capacity >= self._min_capacity[session.session_id])
+    
+    def _assign(self, session: Session, value: Tuple[TimeSlot, Room, Instructor]):
+        """Assign a value and mark its room and instructor as busy in that time slot"""
+        time_slot, room, instructor = value
+        self.assignments[session.session_id] = value
+        self._unassigned_by_pool[self._pool_of[session.session_id]].discard(session.session_id)
+        
+        self._busy_rooms.add((time_slot.slot_id, room.room_id))
+        self._busy_instructors.add((time_slot.slot_id, instructor.instructor_id))
+        for room_key in self._room_pool_keys[room.room_id]:
+            self._free_rooms[room_key][time_slot.slot_id] -= 1
+        for course_id in self._instructor_pool_keys[instructor.instructor_id]:
+            self._free_instructors[course_id][time_slot.slot_id] -= 1
+    
+    def _unassign(self, session_id: str):
+        """Undo _assign"""
+        time_slot, room, instructor = self.assignments.pop(session_id)
+        self._unassigned_by_pool[self._pool_of[session_id]].add(session_id)
+        
+        self._busy_rooms.discard((time_slot.slot_id, room.room_id))
+        self._busy_instructors.discard((time_slot.slot_id, instructor.instructor_id))
+        for room_key in self._room_pool_keys[room.room_id]:
+            self._free_rooms[room_key][time_slot.slot_id] += 1
+        for course_id in self._instructor_pool_keys[instructor.instructor_id]:
+            self._free_instructors[course_id][time_slot.slot_id] += 1
+    
+    def _live_domain_size(self, pool: Tuple[Tuple[str, int], str]) -> int:
+        """Number of consistent values left for sessions using this room / instructor pool"""
+        room_key, course_id = pool
+        return sum(rooms * instructors for rooms, instructors
+                   in zip(self._free_rooms[room_key], self._free_instructors[course_id]))
+    
+    def _propagate(self) -> Optional[List[str]]:
+        """
+        Forward check the unassigned sessions after an assignment
+        
+        Returns the sessions assigned by propagation (always empty for "none" and
+        "fc"), or None if some session has no consistent value left. In that case
+        anything assigned here has already been undone.
+        """
+        forced: List[str] = []
+        if self._consistency == "none":
+            return forced
+        
+        while True:
+            singleton = None
+            wiped_out = False
+            
+            for pool, session_ids in self._unassigned_by_pool.items():
+                if not session_ids:
+                    continue
+                
+                size = self._live_domain_size(pool)
+                if size == 0:
+                    wiped_out = True
+                    break
+                if size == 1 and singleton is None:
+                    singleton = next(iter(session_ids))
+            
+            if not wiped_out and (singleton is None or self._consistency != "mac"):
+                return forced
+            
+            if not wiped_out:
+                # Only one value left for this session, so assign it now and let the
+                # other sessions' domains shrink accordingly
+                session = self._sessions_by_id[singleton]
+                value = next((v for v in self.domains[singleton] if self._is_consistent(session, *v)), None)
+                if value is not None:
+                    self._assign(session, value)
+                    forced.append(singleton)
+                    continue
+            
+            for forced_id in reversed(forced):
+                self._unassign(forced_id)
+            return None
+    
     def _check_hard_constraints(self, session: Session, time_slot: TimeSlot, 
                               room: Room, instructor: Instructor) -> bool:
         """Check hard constraints for a potential assignment"""
         
         # Constraint 1: No instructor can teach more than one class at the same time
-        for assigned_session_id, (assigned_time, assigned_room, assigned_instructor) in self.assignments.items():
-            if (assigned_instructor.instructor_id == instructor.instructor_id and 
-                assigned_time.slot_id == time_slot.slot_id):
-                self.constraint_violations.append(
-                    f"Instructor {instructor.name} double-booked at {time_slot}"
-                )
-                return False
+        if (time_slot.slot_id, instructor.instructor_id) in self._busy_instructors:
+            self.constraint_violations.append(
+                f"Instructor {instructor.name} double-booked at {time_slot}"
+            )
+            return False
         
         # Constraint 2: No room can host more than one class at the same time
-        for assigned_session_id, (assigned_time, assigned_room, assigned_instructor) in self.assignments.items():
-            if (assigned_room.room_id == room.room_id and 
-                assigned_time.slot_id == time_slot.slot_id):
-                self.constraint_violations.append(
-                    f"Room {room.room_id} double-booked at {time_slot}"
-                )
-                return False
+        if (time_slot.slot_id, room.room_id) in self._busy_rooms:
+            self.constraint_violations.append(
+                f"Room {room.room_id} double-booked at {time_slot}"
+            )
+            return False
         
         # Constraint 3: Room capacity must be sufficient
-        section = next((s for s in self.sections if s.section_id == session.section_id), None)
-        if section and room.capacity < section.student_count:
+        student_count = self._min_capacity[session.session_id]
+        if room.capacity < student_count:
             self.constraint_violations.append(
-                f"Room {room.room_id} capacity {room.capacity} insufficient for section {section.section_id} ({section.student_count} students)"
+                f"Room {room.room_id} capacity {room.capacity} insufficient for section {session.section_id} ({student_count} students)"
             )
             return False
         
@@ -430,34 +730,50 @@ class TimetableCSP:
         """Evaluate soft constraints for the current assignment"""
         self.soft_constraint_violations = []
         
-        for session_id, (time_slot, room, instructor) in self.assignments.items():
-            # Find the session object
-            session = next((s for s in self.variables if s.session_id == session_id), None)
-            if not session:
-                continue
-                
-            # Soft constraint 1: Avoid early morning slots (before 10 AM)
-            if time_slot.start_time in ["09:00 AM", "09:45 AM"]:
+        # Only sessions that are CSP variables are evaluated
+        assigned = [(session_id, value) for session_id, value in self.assignments.items()
+                    if session_id in self._session_index]
+        if not assigned:
+            return
+        
+        slot_idx = np.array([time_slot.slot_id for _, (time_slot, _, _) in assigned])
+        pref = np.array([self._preference_ids.get(instructor.preference, -1)
+                         for _, (_, _, instructor) in assigned], dtype=np.int8)
+        
+        # Soft constraint 1: Avoid early morning slots (before 10 AM)
+        early = self._slot_is_early[slot_idx]
+        
+        # Soft constraint 2: Avoid late evening slots (after 3 PM)
+        late = self._slot_is_late[slot_idx]
+        
+        # Soft constraint 3: Respect instructor preferences
+        prefers_morning = (pref == 0) & late
+        prefers_afternoon = (pref == 1) & early
+        prefers_no_thursday = (pref == 2) & self._slot_is_thursday[slot_idx]
+        
+        # Messages are only built for the assignments that break something
+        flagged = early | late | prefers_morning | prefers_afternoon | prefers_no_thursday
+        for n in np.flatnonzero(flagged):
+            session_id, (time_slot, room, instructor) = assigned[n]
+            
+            if early[n]:
                 self.soft_constraint_violations.append(
-                    f"Early morning slot for {session.session_id} at {time_slot}"
+                    f"Early morning slot for {session_id} at {time_slot}"
                 )
-            
-            # Soft constraint 2: Avoid late evening slots (after 3 PM)
-            if time_slot.start_time in ["02:15 PM", "03:00 PM"]:
+            if late[n]:
                 self.soft_constraint_violations.append(
-                    f"Late evening slot for {session.session_id} at {time_slot}"
+                    f"Late evening slot for {session_id} at {time_slot}"
                 )
             
-            # Soft constraint 3: Respect instructor preferences
-            if instructor.preference == "Morning" and time_slot.start_time in ["02:15 PM", "03:00 PM"]:
+            if prefers_morning[n]:
                 self.soft_constraint_violations.append(
                     f"Instructor {instructor.name} prefers morning but assigned to {time_slot}"
                 )
-            elif instructor.preference == "Afternoon" and time_slot.start_time in ["09:00 AM", "09:45 AM"]:
+            elif prefers_afternoon[n]:
                 self.soft_constraint_violations.append(
                     f"Instructor {instructor.name} prefers afternoon but assigned to {time_slot}"
                 )
-            elif instructor.preference == "No_Thursday" and time_slot.day == "Thursday":
+            elif prefers_no_thursday[n]:
                 self.soft_constraint_violations.append(
                     f"Instructor {instructor.name} prefers no Thursday but assigned to {time_slot}"
                 )
@@ -467,28 +783,23 @@ class TimetableCSP:
         if not self.assignments:
             return {"error": "No timetable generated"}
         
+        # Pair each assignment with its session object
+        sessions_by_id = {s.session_id: s for s in self.variables}
+        assigned = [(sessions_by_id[session_id], value) for session_id, value in self.assignments.items()
+                    if session_id in sessions_by_id]
+        
         summary = {
             "total_sessions": len(self.assignments),
             "hard_constraint_violations": len(self.constraint_violations),
             "soft_constraint_violations": len(self.soft_constraint_violations),
-            "sessions_by_day": defaultdict(int),
-            "sessions_by_time": defaultdict(int),
-            "room_utilization": defaultdict(int),
-            "instructor_load": defaultdict(int),
+            "sessions_by_day": Counter(time_slot.day for _, (time_slot, _, _) in assigned),
+            "sessions_by_time": Counter(time_slot.start_time for _, (time_slot, _, _) in assigned),
+            "room_utilization": Counter(room.room_id for _, (_, room, _) in assigned),
+            "instructor_load": Counter(instructor.name for _, (_, _, instructor) in assigned),
             "assignments": []
         }
         
-        for session_id, (time_slot, room, instructor) in self.assignments.items():
-            # Find the session object
-            session = next((s for s in self.variables if s.session_id == session_id), None)
-            if not session:
-                continue
-                
-            summary["sessions_by_day"][time_slot.day] += 1
-            summary["sessions_by_time"][time_slot.start_time] += 1
-            summary["room_utilization"][room.room_id] += 1
-            summary["instructor_load"][instructor.name] += 1
-            
+        for session, (time_slot, room, instructor) in assigned:
             summary["assignments"].append({
                 "session_id": session.session_id,
                 "course": session.course_id,
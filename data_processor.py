@@ -4,13 +4,24 @@ Handles CSV/database integration and data validation
 """
 
 import csv
-import pandas as pd
 import sqlite3
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union, BinaryIO
 from pathlib import Path
 import json
 from datetime import datetime
 
+from openpyxl import Workbook
+
+
+# Generated timetable rows, in display order
+TIMETABLE_QUERY = '''
+    SELECT session_id, course_id, session_type, section_id,
+           day, start_time, end_time, room_id, instructor_id,
+           generation_date
+    FROM generated_timetable
+    ORDER BY day, start_time
+'''
+
 
 class DataProcessor:
     """Handles data loading, validation, and export for the timetable system"""
@@ -19,6 +30,10 @@ class DataProcessor:
         self.data_dir = "data"
         self.db_path = "output/timetable.db"
         
+        # Validation errors per CSV file, keyed by (path, mtime, size) so an
+        # unchanged file is not parsed again
+        self._validated: Dict[tuple, List[str]] = {}
+        
     def validate_csv_files(self, data_dir: str = "data") -> Dict[str, List[str]]:
         """Validate CSV files for required columns and data integrity"""
         validation_results = {}
@@ -41,6 +56,12 @@ class DataProcessor:
                 validation_results[filename] = errors
                 continue
             
+            stat = filepath.stat()
+            cache_key = (str(filepath), stat.st_mtime_ns, stat.st_size)
+            if cache_key in self._validated:
+                validation_results[filename] = list(self._validated[cache_key])
+                continue
+            
             try:
                 with open(filepath, 'r', encoding='utf-8-sig') as file:
                     reader = csv.DictReader(file)
@@ -66,6 +87,7 @@ class DataProcessor:
             except Exception as e:
                 errors.append(f"Error reading file: {str(e)}")
             
+            self._validated[cache_key] = list(errors)
             validation_results[filename] = errors
         
         return validation_results
@@ -76,16 +98,18 @@ class DataProcessor:
         
         # Connect to database
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create tables
-        self._create_tables(cursor)
-        
-        # Load data from CSV files
-        self._load_csv_to_db(cursor, data_dir)
-        
-        conn.commit()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            
+            # Create tables
+            self._create_tables(cursor)
+            
+            # Load data from CSV files
+            self._load_csv_to_db(cursor, data_dir)
+            
+            conn.commit()
+        finally:
+            conn.close()
         print(f"Database created: {self.db_path}")
     
     def _create_tables(self, cursor):
@@ -271,93 +295,141 @@ class DataProcessor:
     def save_timetable_to_db(self, assignments: Dict, generation_info: Dict, csp=None):
         """Save generated timetable to database"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Clear previous timetable
-        cursor.execute('DELETE FROM generated_timetable')
-        
-        # Insert new timetable
-        for session_id, (time_slot, room, instructor) in assignments.items():
-            # Find the session object
-            if csp:
-                session = next((s for s in csp.variables if s.session_id == session_id), None)
-            else:
-                # Create a dummy session if CSP not provided
-                session = type('Session', (), {
-                    'session_id': session_id,
-                    'course_id': 'Unknown',
-                    'session_type': 'Unknown',
-                    'section_id': 'Unknown'
-                })()
+        try:
+            cursor = conn.cursor()
             
-            if not session:
-                continue
+            # Clear previous timetable
+            cursor.execute('DELETE FROM generated_timetable')
+            
+            # Insert new timetable
+            for session_id, (time_slot, room, instructor) in assignments.items():
+                # Find the session object
+                if csp:
+                    session = next((s for s in csp.variables if s.session_id == session_id), None)
+                else:
+                    # Create a dummy session if CSP not provided
+                    session = type('Session', (), {
+                        'session_id': session_id,
+                        'course_id': 'Unknown',
+                        'session_type': 'Unknown',
+                        'section_id': 'Unknown'
+                    })()
                 
-            cursor.execute('''
-                INSERT INTO generated_timetable 
-                (session_id, course_id, session_type, section_id, day, 
-                 start_time, end_time, room_id, instructor_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (session.session_id, session.course_id, session.session_type,
-                  session.section_id, time_slot.day, time_slot.start_time,
-                  time_slot.end_time, room.room_id, instructor.instructor_id))
-        
-        conn.commit()
-        conn.close()
+                if not session:
+                    continue
+                    
+                cursor.execute('''
+                    INSERT INTO generated_timetable 
+                    (session_id, course_id, session_type, section_id, day, 
+                     start_time, end_time, room_id, instructor_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (session.session_id, session.course_id, session.session_type,
+                      session.section_id, time_slot.day, time_slot.start_time,
+                      time_slot.end_time, room.room_id, instructor.instructor_id))
+            
+            conn.commit()
+        finally:
+            conn.close()
         print("Timetable saved to database")
     
     def get_timetable_from_db(self) -> List[Dict]:
         """Retrieve timetable from database"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        try:
+            cursor = conn.cursor()
+            
+            cursor.execute(TIMETABLE_QUERY)
+            
+            results = []
+            for row in cursor.fetchall():
+                results.append({
+                    'session_id': row[0],
+                    'course_id': row[1],
+                    'session_type': row[2],
+                    'section_id': row[3],
+                    'day': row[4],
+                    'start_time': row[5],
+                    'end_time': row[6],
+                    'room_id': row[7],
+                    'instructor_id': row[8],
+                    'generation_date': row[9]
+                })
+        finally:
+            conn.close()
+        return results
+    
+    def database_version(self) -> tuple:
+        """Fingerprint of the database file that changes with every committed write"""
+        path = Path(self.db_path)
+        try:
+            stat = path.stat()
+            # SQLite's file change counter (header bytes 24-27) goes up on each commit,
+            # which catches writes that land within the same mtime tick
+            with open(path, 'rb') as file:
+                file.seek(24)
+                change_counter = int.from_bytes(file.read(4), 'big')
+        except FileNotFoundError:
+            return (0, 0, 0)
+        return (stat.st_mtime_ns, stat.st_size, change_counter)
+    
+    def has_timetable(self) -> bool:
+        """Check whether the database holds a generated timetable, without raising if it doesn't"""
+        if not Path(self.db_path).exists():
+            return False
         
-        cursor.execute('''
-            SELECT session_id, course_id, session_type, section_id,
-                   day, start_time, end_time, room_id, instructor_id,
-                   generation_date
-            FROM generated_timetable
-            ORDER BY day, start_time
-        ''')
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'generated_timetable'"
+            )
+            if cursor.fetchone() is None:
+                return False
+            
+            cursor.execute('SELECT 1 FROM generated_timetable LIMIT 1')
+            return cursor.fetchone() is not None
+        finally:
+            conn.close()
+    
+    def get_timetable_dataframe(self):
+        """Retrieve timetable from database as a DataFrame with Arrow-backed columns"""
+        import pandas as pd
         
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                'session_id': row[0],
-                'course_id': row[1],
-                'session_type': row[2],
-                'section_id': row[3],
-                'day': row[4],
-                'start_time': row[5],
-                'end_time': row[6],
-                'room_id': row[7],
-                'instructor_id': row[8],
-                'generation_date': row[9]
-            })
-        
-        conn.close()
-        return results
+        conn = sqlite3.connect(self.db_path)
+        try:
+            # Arrow string columns hold one UTF-8 buffer each instead of a Python str per cell
+            return pd.read_sql_query(TIMETABLE_QUERY, conn, dtype_backend='pyarrow')
+        finally:
+            conn.close()
     
-    def export_timetable_to_excel(self, filename: str = "output/timetable.xlsx"):
-        """Export timetable to Excel file"""
+    def export_timetable_to_excel(self, filename: Union[str, BinaryIO] = "output/timetable.xlsx"):
+        """Export timetable to Excel, either to a file path or a binary file object"""
         timetable_data = self.get_timetable_from_db()
         
         if not timetable_data:
             print("No timetable data to export")
             return
         
-        df = pd.DataFrame(timetable_data)
+        # Write-only workbooks stream rows out instead of holding every cell in memory
+        workbook = Workbook(write_only=True)
         
-        # Create Excel writer
-        with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-            # Main timetable sheet
-            df.to_excel(writer, sheet_name='Timetable', index=False)
-            
-            # Summary sheet
-            summary_data = self._create_summary_data(timetable_data)
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, sheet_name='Summary', index=False)
+        # Main timetable sheet
+        timetable_sheet = workbook.create_sheet('Timetable')
+        columns = list(timetable_data[0].keys())
+        timetable_sheet.append(columns)
+        for entry in timetable_data:
+            timetable_sheet.append([entry[column] for column in columns])
+        
+        # Summary sheet
+        summary_sheet = workbook.create_sheet('Summary')
+        summary_sheet.append(['Category', 'Item', 'Count'])
+        for entry in self._create_summary_data(timetable_data):
+            summary_sheet.append([entry['Category'], entry['Item'], entry['Count']])
+        
+        workbook.save(filename)
         
-        print(f"Timetable exported to {filename}")
+        if isinstance(filename, str):
+            print(f"Timetable exported to {filename}")
     
     def _create_summary_data(self, timetable_data: List[Dict]) -> List[Dict]:
         """Create summary data for Excel export"""
@@ -386,35 +458,36 @@ class DataProcessor:
     def get_statistics(self) -> Dict[str, Any]:
         """Get statistics about the current data"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        stats = {}
-        
-        # Count records in each table
-        tables = ['time_slots', 'rooms', 'instructors', 'courses', 'sections', 'sessions']
-        for table in tables:
-            cursor.execute(f'SELECT COUNT(*) FROM {table}')
-            stats[f'{table}_count'] = cursor.fetchone()[0]
-        
-        # Room utilization
-        cursor.execute('''
-            SELECT room_id, COUNT(*) as usage_count
-            FROM generated_timetable
-            GROUP BY room_id
-            ORDER BY usage_count DESC
-        ''')
-        stats['room_utilization'] = dict(cursor.fetchall())
-        
-        # Instructor workload
-        cursor.execute('''
-            SELECT instructor_id, COUNT(*) as session_count
-            FROM generated_timetable
-            GROUP BY instructor_id
-            ORDER BY session_count DESC
-        ''')
-        stats['instructor_workload'] = dict(cursor.fetchall())
-        
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            
+            stats = {}
+            
+            # Count records in each table
+            tables = ['time_slots', 'rooms', 'instructors', 'courses', 'sections', 'sessions']
+            for table in tables:
+                cursor.execute(f'SELECT COUNT(*) FROM {table}')
+                stats[f'{table}_count'] = cursor.fetchone()[0]
+            
+            # Room utilization
+            cursor.execute('''
+                SELECT room_id, COUNT(*) as usage_count
+                FROM generated_timetable
+                GROUP BY room_id
+                ORDER BY usage_count DESC
+            ''')
+            stats['room_utilization'] = dict(cursor.fetchall())
+            
+            # Instructor workload
+            cursor.execute('''
+                SELECT instructor_id, COUNT(*) as session_count
+                FROM generated_timetable
+                GROUP BY instructor_id
+                ORDER BY session_count DESC
+            ''')
+            stats['instructor_workload'] = dict(cursor.fetchall())
+        finally:
+            conn.close()
         return stats
     
     def backup_data(self, backup_dir: str = "backups"):
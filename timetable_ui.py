@@ -4,15 +4,265 @@ Clean and easy-to-use interface for generating class timetables
 """
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+import numpy as np
 from datetime import datetime
+import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 
 from csp_timetable import TimetableCSP
 from data_processor import DataProcessor
 
 
+# CSV files the solver loads from the data/ folder
+REQUIRED_FILES = (
+    "Timeslots.csv",
+    "Rooms.csv",
+    "Instructors_data.csv",
+    "Groups.csv",
+    "Sections.csv",
+    "Timetable.csv"
+)
+
+# Loaded data shown on the Data page: CSP attribute, object fields and column names
+DATA_VIEWS = {
+    "Time Slots": ("time_slots", ("day", "start_time", "end_time"), ["Day", "Start", "End"]),
+    "Rooms": ("rooms", ("room_id", "room_type", "capacity"), ["Room", "Type", "Capacity"]),
+    "Instructors": ("instructors", ("instructor_id", "name", "preference"), ["ID", "Name", "Preference"]),
+    "Courses": ("courses", ("course_id", "course_name", "credits"), ["Code", "Name", "Credits"]),
+    "Sessions": ("sessions", ("session_id", "course_id", "session_type", "section_id"),
+                 ["ID", "Course", "Type", "Section"]),
+}
+
+# Plotly config for summary charts that need no hover, zoom or toolbar
+STATIC_CHART = {'staticPlot': True, 'displayModeBar': False}
+
+# Quick stats on the Home page: label -> get_statistics() key
+HOME_METRICS = (
+    ("Time Slots", "time_slots_count"),
+    ("Rooms", "rooms_count"),
+    ("Instructors", "instructors_count"),
+    ("Courses", "courses_count"),
+    ("Sessions to Schedule", "sessions_count"),
+)
+
+# Timetable columns counted for the Statistics charts
+CHART_COLUMNS = ("day", "start_time", "room_id", "instructor_id")
+
+
+def get_csp():
+    """CSP solver of this browser session, kept across its reruns"""
+    if 'csp' not in st.session_state:
+        st.session_state.csp = TimetableCSP()
+    return st.session_state.csp
+
+
+def get_processor():
+    """Data processor of this browser session, kept across its reruns"""
+    if 'processor' not in st.session_state:
+        st.session_state.processor = DataProcessor()
+    return st.session_state.processor
+
+
+@st.cache_resource
+def _executor():
+    """Worker thread that timetable generation runs on"""
+    return ThreadPoolExecutor(max_workers=1)
+
+
+@st.cache_resource
+def _export_executor():
+    """Worker thread for Excel exports, separate so an export never waits on a solve"""
+    return ThreadPoolExecutor(max_workers=1)
+
+
+def _data_signature(csp):
+    """Cheap fingerprint of the data as loaded, used to tell whether the model needs rebuilding"""
+    return tuple((len(items), hash(repr(items)))
+                 for items in (csp.time_slots, csp.rooms, csp.instructors, csp.courses, csp.sessions))
+
+
+class ProgressThrottle:
+    """Forwards solver progress only when it moved by a percent or a quarter second passed"""
+    
+    def __init__(self, update, min_step=0.01, min_interval=0.25):
+        self.update = update
+        self.min_step = min_step
+        self.min_interval = min_interval
+        self.last_value = -1.0
+        self.last_time = 0.0
+    
+    def __call__(self, value):
+        now = time.monotonic()
+        if value - self.last_value >= self.min_step or now - self.last_time >= self.min_interval:
+            self.update(value)
+            self.last_value = value
+            self.last_time = now
+
+
+def _run_generation(csp, processor, max_iterations, signature, job):
+    """Build, solve and save a timetable on the worker thread, reporting through job"""
+    # Step 1: Build CSP model
+    job['status'] = "Building CSP model..."
+    if csp.built_signature != signature:
+        csp.build_csp_model()
+        csp.built_signature = signature
+    if job['cancelled']:
+        return False
+    
+    # Step 2: Solve
+    job['status'] = "Solving CSP (this may take a minute)..."
+    job['progress'] = 25
+    
+    def report(fraction):
+        job['progress'] = 25 + int(50 * fraction)
+    
+    success = csp.solve(max_iterations=max_iterations, progress_callback=ProgressThrottle(report))
+    if not success:
+        return False
+    
+    # Step 3: Evaluate soft constraints
+    job['status'] = "Evaluating constraints..."
+    job['progress'] = 75
+    csp.evaluate_soft_constraints()
+    
+    # Step 4: Save results
+    job['status'] = "Saving results..."
+    job['progress'] = 90
+    generation_info = {
+        'max_iterations': max_iterations,
+        'generation_time': datetime.now().isoformat(),
+        'hard_violations': len(csp.constraint_violations),
+        'soft_violations': len(csp.soft_constraint_violations)
+    }
+    processor.save_timetable_to_db(csp.assignments, generation_info, csp)
+    csp.export_timetable_to_csv()
+    return True
+
+
+def _collect_generation():
+    """Take in a finished generation job, whichever page the session is on"""
+    job = st.session_state.get('generation')
+    if job is None or not job['future'].done():
+        return
+    
+    del st.session_state.generation
+    st.session_state.generation_result = job
+    # The job's solver holds the built model and the solution; it replaces the
+    # session's solver unless different data was loaded while it ran
+    if st.session_state.get('data_signature') == job['signature']:
+        st.session_state.csp = job['csp']
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _check_files(required):
+    """Which of the required files are present in data/, from a single directory listing"""
+    present = set(os.listdir("data")) if os.path.isdir("data") else set()
+    return {file: file in present for file in required}
+
+
+def _data_views(csp):
+    """DataFrames of every kind of loaded data, built once per load for the View Data tab"""
+    import pandas as pd
+    
+    views = {}
+    for data_type, (attribute, fields, columns) in DATA_VIEWS.items():
+        # One pass over the objects, transposed into one tuple per column
+        values = list(zip(*map(attrgetter(*fields), getattr(csp, attribute)))) or [()] * len(fields)
+        views[data_type] = pd.DataFrame(dict(zip(columns, values)))
+    return views
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _statistics(_processor, version):
+    """Database statistics for the Home page, cached until the database changes"""
+    return _processor.get_statistics()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _has_timetable(_processor, version):
+    """Whether a generated timetable is in the database, cached until the database changes"""
+    return _processor.has_timetable()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _timetable_df(_processor, version):
+    """Generated timetable as a DataFrame, cached until the database changes"""
+    df = _processor.get_timetable_dataframe()
+    # Repeated ids become integer-coded categories, so counts and filters skip string hashing
+    for column in CHART_COLUMNS + ('course_id',):
+        df[column] = df[column].astype('category')
+    return df
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _display_df(_processor, version):
+    """The columns of the generated timetable shown in the Timetable tab"""
+    return _timetable_df(_processor, version)[['day', 'start_time', 'end_time', 'course_id', 'session_type',
+                                                'section_id', 'room_id', 'instructor_id']].copy()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _filter_options(_processor, version):
+    """Sorted days, instructors and rooms of the generated timetable for the filters"""
+    df = _timetable_df(_processor, version)
+    # The categories are the distinct values, already sorted when the column was converted
+    return tuple(df[c].cat.categories.tolist() for c in ('day', 'instructor_id', 'room_id'))
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _chart_counts(_processor, version):
+    """Session counts by day, start time, room and instructor for the Statistics charts"""
+    df = _timetable_df(_processor, version)
+    # Groups in order of first appearance plus a stable sort break ties the way value_counts does
+    counts = {c: df.groupby(c, observed=True, sort=False).size().sort_values(ascending=False, kind='stable')
+              for c in CHART_COLUMNS}
+    counts['room_id'] = counts['room_id'].head(10)
+    for c in ('start_time', 'instructor_id'):
+        counts[c] = _topn(counts[c])
+    return counts
+
+
+def _topn(counts, n=15):
+    """The n largest counts, with the rest summed into one "Other" bar"""
+    import pandas as pd
+    
+    if len(counts) <= n:
+        return counts
+    return pd.concat([counts.head(n), pd.Series({'Other': counts.iloc[n:].sum()})])
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _csv_bytes(_processor, version):
+    """Generated timetable serialized as CSV for the download button"""
+    buffer = io.BytesIO()
+    _timetable_df(_processor, version).to_csv(buffer, index=False, encoding='utf-8')
+    return buffer.getvalue()
+
+
+@st.cache_data(ttl=600, show_spinner=False)
+def _excel_bytes(_processor, version):
+    """Generated timetable as an Excel workbook, built in memory for the download button"""
+    buffer = io.BytesIO()
+    _processor.export_timetable_to_excel(buffer)
+    return buffer.getvalue()
+
+
+@st.cache_resource(ttl=600, show_spinner=False)
+def _bar_fig(_processor, version, column, x_label):
+    """Bar chart of one of the _chart_counts series, reused across reruns"""
+    # Only the Statistics tab draws charts, so plotly is imported on first use
+    import plotly.graph_objects as go
+    
+    # Plain arrays go straight into the trace, skipping plotly express's DataFrame round trip
+    counts = _chart_counts(_processor, version)[column]
+    fig = go.Figure(go.Bar(x=counts.index.to_numpy(), y=counts.to_numpy()))
+    fig.update_layout(xaxis_title=x_label, yaxis_title='Sessions')
+    return fig
+
+
 def main():
     """Main application"""
     st.set_page_config(
@@ -29,10 +279,13 @@ def main():
     # Initialize session state
     if 'timetable_generated' not in st.session_state:
         st.session_state.timetable_generated = False
-    if 'csp' not in st.session_state:
-        st.session_state.csp = TimetableCSP()
-    if 'processor' not in st.session_state:
-        st.session_state.processor = DataProcessor()
+    if 'data_loaded' not in st.session_state:
+        st.session_state.data_loaded = False
+    # Date stamp for download file names, formatted once per session
+    if 'session_date' not in st.session_state:
+        st.session_state.session_date = datetime.now().strftime('%Y%m%d')
+    
+    _collect_generation()
     
     # Sidebar for navigation
     st.sidebar.title("Navigation")
@@ -54,6 +307,7 @@ def main():
 
 def show_home():
     """Home page with project overview"""
+    processor = get_processor()
     st.header("Welcome to the Timetable Generator!")
     
     col1, col2 = st.columns(2)
@@ -82,21 +336,13 @@ def show_home():
     
     with col2:
         st.subheader("Quick Stats")
-        try:
-            stats = st.session_state.processor.get_statistics()
-            
-            metrics = [
-                ("Time Slots", stats.get('time_slots_count', 0)),
-                ("Rooms", stats.get('rooms_count', 0)),
-                ("Instructors", stats.get('instructors_count', 0)),
-                ("Courses", stats.get('courses_count', 0)),
-                ("Sessions to Schedule", stats.get('sessions_count', 0))
-            ]
+        if st.session_state.data_loaded:
+            stats = _statistics(processor, processor.database_version())
             
-            for label, value in metrics:
-                st.metric(label, value)
-                
-        except Exception as e:
+            cols = st.columns(len(HOME_METRICS))
+            for col, (label, key) in zip(cols, HOME_METRICS):
+                col.metric(label, stats.get(key, 0))
+        else:
             st.info("Load data files to see statistics")
         
         st.subheader("Getting Started")
@@ -107,6 +353,8 @@ def show_home():
 
 def show_data_page():
     """Data loading and validation page"""
+    csp = get_csp()
+    processor = get_processor()
     st.header("Data Management")
     
     tab1, tab2 = st.tabs(["Load Data", "View Data"])
@@ -115,21 +363,11 @@ def show_data_page():
         st.subheader("Load CSV Files")
         st.write("The system needs these CSV files from the `data/` folder:")
         
-        required_files = [
-            "Timeslots.csv",
-            "Rooms.csv", 
-            "Instructors_data.csv",
-            "Groups.csv",
-            "Sections.csv",
-            "Timetable.csv"
-        ]
-        
         # Check which files exist
         st.write("**File Status:**")
         all_exist = True
-        for file in required_files:
-            file_path = os.path.join("data", file)
-            if os.path.exists(file_path):
+        for file, exists in _check_files(REQUIRED_FILES).items():
+            if exists:
                 st.success(f"{file}")
             else:
                 st.error(f"{file} - Missing!")
@@ -138,22 +376,26 @@ def show_data_page():
         st.divider()
         
         if all_exist:
-            if st.button("Load Data", type="primary", use_container_width=True):
+            if st.button("Load Data", type="primary", width="stretch"):
                 with st.spinner("Loading data..."):
                     try:
                         # Load data
-                        st.session_state.csp.load_data_from_csv()
-                        st.session_state.processor.create_database()
+                        csp.load_data_from_csv()
+                        # Taken before any build, which may append placeholder courses
+                        st.session_state.data_signature = _data_signature(csp)
+                        st.session_state.data_views = _data_views(csp)
+                        processor.create_database()
+                        st.session_state.data_loaded = True
                         
                         st.success("Data loaded successfully!")
                         
                         # Show summary
                         st.write("**Loaded:**")
-                        st.write(f"- {len(st.session_state.csp.time_slots)} time slots")
-                        st.write(f"- {len(st.session_state.csp.rooms)} rooms")
-                        st.write(f"- {len(st.session_state.csp.instructors)} instructors")
-                        st.write(f"- {len(st.session_state.csp.courses)} courses")
-                        st.write(f"- {len(st.session_state.csp.sessions)} sessions")
+                        st.write(f"- {len(csp.time_slots)} time slots")
+                        st.write(f"- {len(csp.rooms)} rooms")
+                        st.write(f"- {len(csp.instructors)} instructors")
+                        st.write(f"- {len(csp.courses)} courses")
+                        st.write(f"- {len(csp.sessions)} sessions")
                         
                     except Exception as e:
                         st.error(f"Error loading data: {str(e)}")
@@ -163,60 +405,29 @@ def show_data_page():
     with tab2:
         st.subheader("View Loaded Data")
         
-        if len(st.session_state.csp.time_slots) == 0:
+        if len(csp.time_slots) == 0:
             st.info("Load data first to view it here")
         else:
             data_type = st.selectbox(
                 "Select data to view",
-                ["Time Slots", "Rooms", "Instructors", "Courses", "Sessions"]
+                list(DATA_VIEWS)
             )
             
-            if data_type == "Time Slots":
-                df = pd.DataFrame([
-                    {"Day": ts.day, "Start": ts.start_time, "End": ts.end_time}
-                    for ts in st.session_state.csp.time_slots
-                ])
-                st.dataframe(df, use_container_width=True)
-                
-            elif data_type == "Rooms":
-                df = pd.DataFrame([
-                    {"Room": r.room_id, "Type": r.room_type, "Capacity": r.capacity}
-                    for r in st.session_state.csp.rooms
-                ])
-                st.dataframe(df, use_container_width=True)
-                
-            elif data_type == "Instructors":
-                df = pd.DataFrame([
-                    {"ID": i.instructor_id, "Name": i.name, "Preference": i.preference}
-                    for i in st.session_state.csp.instructors
-                ])
-                st.dataframe(df, use_container_width=True)
-                
-            elif data_type == "Courses":
-                df = pd.DataFrame([
-                    {"Code": c.course_id, "Name": c.course_name, "Credits": c.credits}
-                    for c in st.session_state.csp.courses
-                ])
-                st.dataframe(df, use_container_width=True)
-                
-            elif data_type == "Sessions":
-                df = pd.DataFrame([
-                    {"ID": s.session_id, "Course": s.course_id, "Type": s.session_type, "Section": s.section_id}
-                    for s in st.session_state.csp.sessions
-                ])
-                st.dataframe(df, use_container_width=True)
+            st.dataframe(st.session_state.data_views[data_type], width="stretch")
 
 
 def show_generate_page():
     """Timetable generation page"""
+    csp = get_csp()
+    processor = get_processor()
     st.header("Generate Timetable")
     
     # Check if data is loaded
-    if len(st.session_state.csp.sessions) == 0:
+    if len(csp.sessions) == 0:
         st.warning("Please load data first (go to Data page)")
         return
     
-    st.write(f"Ready to schedule **{len(st.session_state.csp.sessions)} sessions**")
+    st.write(f"Ready to schedule **{len(csp.sessions)} sessions**")
     
     col1, col2 = st.columns(2)
     
@@ -246,81 +457,75 @@ def show_generate_page():
         st.write("Click the button below to start generating the timetable.")
         st.write("This may take 30-60 seconds depending on the data size.")
         
-        if st.button("Generate Timetable", type="primary", use_container_width=True):
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+        job = st.session_state.get('generation')
+        
+        if job is None and st.button("Generate Timetable", type="primary", width="stretch"):
+            # Each job solves on its own copy of the solver, on a worker thread so
+            # the app stays responsive and reloading data can't disturb it
+            job = {'status': "Starting...", 'progress': 0, 'cancelled': False,
+                   'csp': csp.copy_for_solve(), 'signature': st.session_state.data_signature}
+            job['future'] = _executor().submit(_run_generation, job['csp'], processor, max_iterations,
+                                               job['signature'], job)
+            st.session_state.generation = job
+        
+        if job is not None:
+            st.progress(job['progress'])
+            st.text(job['status'])
             
-            try:
-                # Step 1: Build CSP model
-                status_text.text("Building CSP model...")
-                progress_bar.progress(25)
-                st.session_state.csp.build_csp_model()
-                
-                # Step 2: Solve
-                status_text.text("Solving CSP (this may take a minute)...")
-                progress_bar.progress(50)
-                success = st.session_state.csp.solve(max_iterations=max_iterations)
-                
-                if success:
-                    # Step 3: Evaluate soft constraints
-                    status_text.text("Evaluating constraints...")
-                    progress_bar.progress(75)
-                    st.session_state.csp.evaluate_soft_constraints()
-                    
-                    # Step 4: Save results
-                    status_text.text("Saving results...")
-                    progress_bar.progress(90)
-                    
-                    assignments = st.session_state.csp.assignments
-                    generation_info = {
-                        'max_iterations': max_iterations,
-                        'generation_time': datetime.now().isoformat(),
-                        'hard_violations': len(st.session_state.csp.constraint_violations),
-                        'soft_violations': len(st.session_state.csp.soft_constraint_violations)
-                    }
-                    
-                    st.session_state.processor.save_timetable_to_db(assignments, generation_info, st.session_state.csp)
-                    st.session_state.csp.export_timetable_to_csv()
-                    
-                    # Complete
-                    progress_bar.progress(100)
-                    status_text.text("Complete!")
-                    
-                    st.success("Timetable generated successfully!")
-                    
-                    # Show summary
-                    st.write("**Results:**")
-                    st.write(f"- Total sessions scheduled: {len(st.session_state.csp.assignments)}")
-                    st.write(f"- Hard constraint violations: {len(st.session_state.csp.constraint_violations)}")
-                    st.write(f"- Soft constraint violations: {len(st.session_state.csp.soft_constraint_violations)}")
-                    
-                    st.session_state.timetable_generated = True
-                    
-                    st.info("Go to Results page to view and export the timetable")
-                    
-                else:
-                    st.error("Could not find a valid solution. Try increasing max iterations or checking your data.")
-                    
-            except Exception as e:
-                st.error(f"Error during generation: {str(e)}")
+            if st.button("Cancel", width="stretch"):
+                job['cancelled'] = True
+                job['future'].cancel()
+                job['csp'].stop_requested = True
+        
+        job = st.session_state.pop('generation_result', None)
+        if job is not None:
+            future = job['future']
+            if job['cancelled']:
+                st.warning("Generation cancelled")
+            elif future.exception() is not None:
+                error = future.exception()
+                st.error(f"Error during generation: {str(error)}")
                 import traceback
                 with st.expander("Error Details"):
-                    st.code(traceback.format_exc())
+                    st.code("".join(traceback.format_exception(type(error), error, error.__traceback__)))
+            elif future.result():
+                # Complete
+                st.progress(100)
+                st.text("Complete!")
+                
+                st.success("Timetable generated successfully!")
+                
+                # Show summary
+                st.write("**Results:**")
+                result = job['csp']
+                st.write(f"- Total sessions scheduled: {len(result.assignments)}")
+                st.write(f"- Hard constraint violations: {len(result.constraint_violations)}")
+                st.write(f"- Soft constraint violations: {len(result.soft_constraint_violations)}")
+                
+                st.session_state.timetable_generated = True
+                
+                st.info("Go to Results page to view and export the timetable")
+                
+            else:
+                st.error("Could not find a valid solution. Try increasing max iterations or checking your data.")
+    
+    # Keep rerunning while the worker is busy so progress stays up to date
+    if 'generation' in st.session_state:
+        time.sleep(0.5)
+        st.rerun()
 
 
 def show_results_page():
     """Results viewing and export page"""
+    processor = get_processor()
     st.header("Results")
     
+    # Every cached view of the database is keyed on the database file itself, so a
+    # write from any session or worker thread is picked up on the next rerun
+    version = processor.database_version()
+    
     # Check if timetable exists
-    try:
-        timetable_data = st.session_state.processor.get_timetable_from_db()
-        
-        if not timetable_data:
-            st.info("No timetable generated yet. Go to **⚙️ Generate** page to create one.")
-            return
-            
-    except Exception as e:
+    if not _has_timetable(processor, version):
         st.info("No timetable generated yet. Go to **⚙️ Generate** page to create one.")
         return
     
@@ -328,124 +533,40 @@ def show_results_page():
     tab1, tab2, tab3 = st.tabs(["Timetable", "Statistics", "Export"])
     
     with tab1:
-        st.subheader("Generated Timetable")
-        
-        df = pd.DataFrame(timetable_data)
-        
-        # Filters
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            days = ["All"] + sorted(df['day'].unique().tolist())
-            selected_day = st.selectbox("Filter by Day", days)
-        
-        with col2:
-            instructors = ["All"] + sorted(df['instructor_id'].unique().tolist())
-            selected_instructor = st.selectbox("Filter by Instructor", instructors)
-        
-        with col3:
-            rooms = ["All"] + sorted(df['room_id'].unique().tolist())
-            selected_room = st.selectbox("Filter by Room", rooms)
-        
-        # Apply filters
-        filtered_df = df.copy()
-        if selected_day != "All":
-            filtered_df = filtered_df[filtered_df['day'] == selected_day]
-        if selected_instructor != "All":
-            filtered_df = filtered_df[filtered_df['instructor_id'] == selected_instructor]
-        if selected_room != "All":
-            filtered_df = filtered_df[filtered_df['room_id'] == selected_room]
-        
-        # Display table
-        st.dataframe(
-            filtered_df[['day', 'start_time', 'end_time', 'course_id', 'session_type', 
-                        'section_id', 'room_id', 'instructor_id']],
-            use_container_width=True,
-            height=400
-        )
-        
-        st.write(f"Showing {len(filtered_df)} of {len(df)} sessions")
+        _timetable_tab(processor, version)
     
     with tab2:
-        st.subheader("Statistics")
-        
-        df = pd.DataFrame(timetable_data)
-        
-        # Key metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric("Total Sessions", len(df))
-        with col2:
-            st.metric("Rooms Used", df['room_id'].nunique())
-        with col3:
-            st.metric("Instructors", df['instructor_id'].nunique())
-        with col4:
-            st.metric("Days", df['day'].nunique())
-        
-        st.divider()
-        
-        # Charts
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Sessions by Day**")
-            day_counts = df['day'].value_counts()
-            fig = px.bar(x=day_counts.index, y=day_counts.values,
-                        labels={'x': 'Day', 'y': 'Sessions'})
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.write("**Sessions by Time**")
-            time_counts = df['start_time'].value_counts().head(10)
-            fig = px.bar(x=time_counts.index, y=time_counts.values,
-                        labels={'x': 'Start Time', 'y': 'Sessions'})
-            st.plotly_chart(fig, use_container_width=True)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.write("**Top 10 Most Used Rooms**")
-            room_counts = df['room_id'].value_counts().head(10)
-            fig = px.bar(x=room_counts.index, y=room_counts.values,
-                        labels={'x': 'Room', 'y': 'Sessions'})
-            st.plotly_chart(fig, use_container_width=True)
-        
-        with col2:
-            st.write("**Instructor Workload**")
-            inst_counts = df['instructor_id'].value_counts().head(10)
-            fig = px.bar(x=inst_counts.index, y=inst_counts.values,
-                        labels={'x': 'Instructor', 'y': 'Sessions'})
-            st.plotly_chart(fig, use_container_width=True)
+        _statistics_tab(processor, version)
     
     with tab3:
         st.subheader("Export Timetable")
         
         st.write("Download the generated timetable in different formats:")
         
+        # Download data is only serialized when a button is clicked
         col1, col2 = st.columns(2)
         
         with col1:
             # CSV download
-            df = pd.DataFrame(timetable_data)
-            csv_data = df.to_csv(index=False)
-            
             st.download_button(
                 label="Download CSV",
-                data=csv_data,
-                file_name=f"timetable_{datetime.now().strftime('%Y%m%d')}.csv",
+                data=lambda: _csv_bytes(processor, version),
+                file_name=f"timetable_{st.session_state.session_date}.csv",
                 mime="text/csv",
-                use_container_width=True
+                width="stretch"
             )
         
         with col2:
             # Excel export
-            if st.button("Export to Excel", use_container_width=True):
-                try:
-                    st.session_state.processor.export_timetable_to_excel()
-                    st.success("Excel file saved to output/timetable.xlsx")
-                except Exception as e:
-                    st.error(f"Error exporting: {str(e)}")
+            _excel_export(processor)
+            
+            st.download_button(
+                label="Download Excel",
+                data=lambda: _excel_bytes(processor, version),
+                file_name=f"timetable_{st.session_state.session_date}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                width="stretch"
+            )
         
         st.divider()
         st.write("**File Locations:**")
@@ -454,5 +575,127 @@ def show_results_page():
         st.write("- Excel: `output/timetable.xlsx`")
 
 
+
+@st.fragment
+def _timetable_tab(processor, version):
+    """Timetable tab of the Results page; filter changes only rerun this tab"""
+    st.subheader("Generated Timetable")
+    
+    # Filters
+    days, instructors, rooms = _filter_options(processor, version)
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        selected_day = st.selectbox("Filter by Day", ["All"] + days)
+    
+    with col2:
+        selected_instructor = st.selectbox("Filter by Instructor", ["All"] + instructors)
+    
+    with col3:
+        selected_room = st.selectbox("Filter by Room", ["All"] + rooms)
+    
+    # Apply filters as one combined mask, indexing the frame once
+    display_df = _display_df(processor, version)
+    mask = np.ones(len(display_df), dtype=bool)
+    if selected_day != "All":
+        mask &= (display_df['day'] == selected_day).to_numpy()
+    if selected_instructor != "All":
+        mask &= (display_df['instructor_id'] == selected_instructor).to_numpy()
+    if selected_room != "All":
+        mask &= (display_df['room_id'] == selected_room).to_numpy()
+    # With nothing filtered out the cached frame is shown as is, without a copy
+    filtered_df = display_df if mask.all() else display_df.iloc[mask]
+    
+    # Display table
+    st.dataframe(
+        filtered_df,
+        width="stretch",
+        height=400
+    )
+    
+    st.write(f"Showing {len(filtered_df)} of {len(display_df)} sessions")
+
+
+def _excel_export(processor):
+    """Excel export controls, run as a fragment that polls only while an export is running"""
+    run_every = 0.5 if 'export_future' in st.session_state else None
+    st.fragment(_excel_export_status, run_every=run_every)(processor)
+
+
+def _excel_export_status(processor):
+    """Saves the Excel file on a worker thread and reports when it has been written"""
+    future = st.session_state.get('export_future')
+    if future is not None and future.done():
+        del st.session_state.export_future
+        if future.exception() is not None:
+            st.session_state.export_result = ('error', f"Error exporting: {str(future.exception())}")
+        else:
+            st.session_state.export_result = ('success', "Excel file saved to output/timetable.xlsx")
+        # One full rerun redraws the fragment without its polling timer
+        st.rerun()
+    
+    if future is None and st.button("Export to Excel", width="stretch"):
+        st.session_state.export_future = _export_executor().submit(processor.export_timetable_to_excel)
+        # One full rerun redraws the fragment with its polling timer
+        st.rerun()
+    
+    if future is not None:
+        st.info("Exporting...")
+    elif 'export_result' in st.session_state:
+        kind, message = st.session_state.pop('export_result')
+        if kind == 'error':
+            st.error(message)
+        else:
+            st.success(message)
+
+
+@st.fragment
+def _statistics_tab(processor, version):
+    """Statistics tab of the Results page, kept out of the Timetable tab's reruns"""
+    st.subheader("Statistics")
+    
+    df = _timetable_df(processor, version)
+    
+    # Key metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("Total Sessions", len(df))
+    with col2:
+        st.metric("Rooms Used", df['room_id'].nunique())
+    with col3:
+        st.metric("Instructors", df['instructor_id'].nunique())
+    with col4:
+        st.metric("Days", df['day'].nunique())
+    
+    st.divider()
+    
+    # Charts
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Sessions by Day**")
+        fig = _bar_fig(processor, version, 'day', 'Day')
+        st.plotly_chart(fig, width="stretch", config=STATIC_CHART)
+    
+    with col2:
+        st.write("**Sessions by Time**")
+        fig = _bar_fig(processor, version, 'start_time', 'Start Time')
+        # Left interactive so the time slots can be hovered and zoomed
+        st.plotly_chart(fig, width="stretch")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write("**Top 10 Most Used Rooms**")
+        fig = _bar_fig(processor, version, 'room_id', 'Room')
+        st.plotly_chart(fig, width="stretch", config=STATIC_CHART)
+    
+    with col2:
+        st.write("**Instructor Workload**")
+        fig = _bar_fig(processor, version, 'instructor_id', 'Instructor')
+        st.plotly_chart(fig, width="stretch", config=STATIC_CHART)
+
+
 if __name__ == "__main__":
     main()